@@ -21,10 +21,13 @@ Features
 
 from __future__ import annotations
 
+import base64
+import threading
 import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog
+from tkinter import ttk
 from enum import Enum
-from typing import Dict, List, Tuple
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Tuple
 
 # --------------------------------------------------------------------------- #
 # Card definitions
@@ -57,20 +60,43 @@ class Room(Enum):
     STUDY          = "Study"
 
 Card = Suspect | Weapon | Room
-CARDS: List[Card] = [*Suspect, *Weapon, *Room]
+SUSPECTS: Tuple[Suspect, ...] = tuple(Suspect)
+WEAPONS: Tuple[Weapon, ...] = tuple(Weapon)
+ROOMS: Tuple[Room, ...] = tuple(Room)
+GROUPS: Tuple[Tuple[Card, ...], ...] = (SUSPECTS, WEAPONS, ROOMS)
+CARDS: List[Card] = [*SUSPECTS, *WEAPONS, *ROOMS]
 TOTAL_IN_PLAY = len(CARDS) - 3          # 3 cards in the case‑file
+ALL_CARDS_MASK = (1 << len(CARDS)) - 1  # one bit per card, in CARDS order
 
-CARD_LOOKUP: Dict[str, Card] = (
+# exact enum names as emitted by the buttons / grid rows (e.g. "SCARLET")
+CARD_BY_NAME: Dict[str, Card] = {c.name: c for c in CARDS}
+
+CARD_LOOKUP: Mapping[str, Card] = MappingProxyType(
     {c.name.lower(): c for c in CARDS} |
     {c.value.lower(): c for c in CARDS}
 )
 
+# group ids: 0 = suspect, 1 = weapon, 2 = room
+CARD_GROUP: Dict[Card, int] = {
+    c: (0 if isinstance(c, Suspect) else 1 if isinstance(c, Weapon) else 2)
+    for c in CARDS
+}
+
 NO_SYMBOL, YES_SYMBOL, MAYBE_SYMBOL = "❌", "✅", "?"
+_DEFINITIVE = frozenset({YES_SYMBOL, NO_SYMBOL})
+
+# cell state is stored as one byte per (card, player); "" means unmarked
+_SYM: Tuple[str, ...] = ("", NO_SYMBOL, YES_SYMBOL, MAYBE_SYMBOL)
+_SYM_CODE: Dict[str, int] = {s: i for i, s in enumerate(_SYM)}
+_NO_CODE, _YES_CODE, _MAYBE_CODE = 1, 2, 3
 
 # --------------------------------------------------------------------------- #
 class CluedoGUI(tk.Tk):
     PAD = {"padx": 6, "pady": 6}
     MIN_P, MAX_P = 3, 6
+    # state-grid geometry
+    CARD_COL_W, COL_W = 180, 70
+    HDR_H, ROW_H = 24, 22
 
     # ..................................................................... #
     def __init__(self) -> None:
@@ -79,17 +105,54 @@ class CluedoGUI(tk.Tk):
         self.resizable(True, True)
 
         self.card_images: Dict[str, tk.PhotoImage] = {}
+        try:
+            self._fallback_img = tk.PhotoImage(file="cards/card.png")
+        except Exception as e:
+            from tkinter import messagebox
+            messagebox.showwarning("Image Load Error", f"Could not load card.png\n{e}")
+            self._fallback_img = None
 
         self.num_players = 4
         self.players: List[str] = []
         self.expected: Dict[str, int] = {}
         self.known: Dict[str, int]   = {}
 
-        self.grid_state: Dict[Tuple[Card, str], str] = {}
-        self.case: Dict[str, Card] = {}          # NEW – found solution pieces
+        self._card_idx: Dict[Card, int] = {c: i for i, c in enumerate(CARDS)}
+        self._state = bytearray(len(CARDS) * self.MAX_P)
+        # found solution pieces, one slot per group (suspect, weapon, room)
+        self.case_card: List[Card | None] = [None, None, None]
+
+        self._dirty_rows: set[Card] = set()      # rows touched since last flush
+        self._yes_players: Dict[Card, set[str]] = {c: set() for c in CARDS}
+        self._no_counts: Dict[Card, int] = {c: 0 for c in CARDS}
+        self._unsolved: List[set[Card]] = [set(g) for g in GROUPS]
+        self._pending_case: List[Card] = []      # cards that just went all-❌
+
+        # per-player bitmasks over CARDS: cards they may still hold / surely hold
+        self._possible: List[int] = [ALL_CARDS_MASK] * self.MAX_P
+        self._definite: List[int] = [0] * self.MAX_P
+        self._ask_constraints: List[Tuple[int, int]] = []  # (player idx, trio mask)
+        self._row_labels: Dict[Card, str] = {c: c.name.capitalize() for c in CARDS}
+        self._starred: set[Card] = set()
+        self._hdr_known: Dict[str, int] = {}     # known-count behind each heading
+
+        self._cmds = {
+            "own":  self._c_own,
+            "not":  self._c_not,
+            "has":  self._c_has,
+            "ask":  self._c_ask,
+            "play": self._c_play,      # ⇒ play = ask with bypass logic
+            "is":   self._c_is,
+            "reset": lambda *_: self._reset(),
+            "help":  lambda *_: self._help(),
+        }
 
         self._build_menu()
-        self._build_ui()
+        self._compute_totals()
+        self._build_ui_once()
+
+        # card art streams in off-thread; the palette starts on the fallback
+        threading.Thread(target=self._preload_images, daemon=True).start()
 
     # ------------------------------------------------------------------ #
     # Menu
@@ -114,37 +177,33 @@ class CluedoGUI(tk.Tk):
     # UI
     # ------------------------------------------------------------------ #
     def _get_card_image(self, name: str) -> tk.PhotoImage:
-        """Load and cache the image for a card (e.g., 'scarlet.png'). Fallback to 'card.png'."""
-        name = name.lower()
-        if name in self.card_images:
-            return self.card_images[name]
-        try:
-            img = tk.PhotoImage(file=f"cards/{name}.png")
-        except Exception:
-            img = self.card_image  # fallback to default
+        """Return the image for a card (e.g., 'scarlet') if it has loaded yet,
+        else the 'card.png' fallback."""
+        return self.card_images.get(name.lower(), self._fallback_img)
+
+    def _preload_images(self) -> None:
+        """Read the card PNGs off-thread so startup never blocks on ~21
+        decodes.  Tk is not thread-safe, so the bytes are handed back to the
+        main thread via after() and turned into PhotoImages there."""
+        for c in CARDS:
+            name = c.name.lower()
+            try:
+                with open(f"cards/{name}.png", "rb") as fh:
+                    data = base64.b64encode(fh.read())
+            except OSError:
+                continue            # missing art – the fallback stays in place
+            self.after(0, self._install_image, name, data)
+
+    def _install_image(self, name: str, data: bytes) -> None:
+        img = tk.PhotoImage(data=data)
         self.card_images[name] = img
-        return img
-
-
-
-    def _build_ui(self) -> None:
-        for w in self.winfo_children():
-            w.destroy()
-
-        self.grid_state.clear()
-
-            # Load card image
-        try:
-            self.card_image = tk.PhotoImage(file="cards/card.png")
-
-        except Exception as e:
-            messagebox.showwarning("Image Load Error", f"Could not load card.png\n{e}")
-            self.card_image = None
-
-
-        self.known.clear()
-        self._compute_totals()
+        item = self._palette_imgs.get(name)
+        if item is not None:
+            self.palette.itemconfigure(item, image=img)
 
+    def _build_ui_once(self) -> None:
+        """Build the widget tree.  Called exactly once, from __init__;
+        resets and player-count changes only mutate the existing widgets."""
         # Layout container
         main = ttk.Frame(self)
         main.grid(row=0, column=0, sticky="nsew")
@@ -164,22 +223,12 @@ class CluedoGUI(tk.Tk):
         top.pack(fill="x")
         ttk.Button(top, text="Players…", command=self._player_count_dialog).pack(side="left")
 
-        # ▶ Treeview grid
-        self.tree = ttk.Treeview(
-            left_panel, columns=["card", *self.players],
-            show="headings", height=len(CARDS)
-        )
-        self.tree.heading("card", text="Card")
-        self.tree.column("card", width=180, anchor="w")
-        for p in self.players:
-            self.tree.heading(p, text=self._hdr(p))
-            self.tree.column(p, width=70, anchor="center")
-        for card in CARDS:
-            short_name = card.name.capitalize()
-            self.tree.insert("", "end", iid=card.name, values=[short_name] + ["" for _ in self.players])
-
-        self.tree.bind("<<TreeviewSelect>>", self._on_row_click)
-        self.tree.pack(fill="both", expand=True, **self.PAD)
+        # ▶ state grid – a flat Canvas of text items; updating a cell is one
+        #   itemconfigure call with no row-level restyle or redraw
+        self.grid_canvas = tk.Canvas(left_panel, highlightthickness=0)
+        self.grid_canvas.pack(**self.PAD)
+        self.grid_canvas.bind("<Button-1>", self._on_grid_click)
+        self._draw_grid()
 
         # ▶ live suggestion label
         self.suggest_var = tk.StringVar(value="Next suggestion → …")
@@ -203,68 +252,112 @@ class CluedoGUI(tk.Tk):
         self.entry.bind("<Return>", self._on_cmd)
         ttk.Button(bar, text="Execute", command=self._on_cmd).pack(side="left", padx=4)
 
-        # ▶ right panel – clickable cards
-        for label, group in (("Suspects", Suspect), ("Weapons", Weapon)):
-            section = ttk.LabelFrame(right_panel, text=label)
-            section.pack(fill="x", pady=4)
-            for card in group:
-                btn = ttk.Button(
-                    section,
-                    text=card.name.capitalize(),
-                    image=self._get_card_image(card.name),
-                    compound="top",  # image left of text
-                    width=1,
-                    command=lambda c=card.name: self._append_entry(c)
-                )
-                btn.pack(side="left", padx=2, pady=2)
-
-        # Room cards → split into two rows
-        room_section = ttk.LabelFrame(right_panel, text="Rooms")
-        room_section.pack(fill="x", pady=4)
-
-        rooms = list(Room)
-        half = len(rooms) // 2
-
-        upper_row = ttk.Frame(room_section)
-        upper_row.pack(fill="x")
-        for card in rooms[:half]:
-            btn = ttk.Button(
-                upper_row,
-                text=card.name.capitalize(),
-                image=self._get_card_image(card.name),
-
-                compound="top",  # image left of text
-                width=1,
-                command=lambda c=card.name: self._append_entry(c)
-            )
-            btn.pack(side="left", padx=2, pady=2)
-
-        lower_row = ttk.Frame(room_section)
-        lower_row.pack(fill="x")
-        for card in rooms[half:]:
-            btn = ttk.Button(
-                lower_row,
-                text=card.value,
-                image=self._get_card_image(card.name),
-
-                compound="top",  # image left of text
-                width=1,
-                command=lambda c=card.name: self._append_entry(c)
-            )
-            btn.pack(side="left", padx=2, pady=2)
-
-
-
+        # ▶ right panel – clickable card palette (one Canvas, one binding,
+        #   instead of 21 ttk.Buttons each holding its own lambda)
+        half = len(ROOMS) // 2
+        sections = (
+            ("Suspects", (SUSPECTS,)),
+            ("Weapons",  (WEAPONS,)),
+            ("Rooms",    (ROOMS[:half], ROOMS[half:])),
+        )
+        cell_w, cell_h, title_h = 68, 118, 18
+        max_cols = max(len(row) for _, rows in sections for row in rows)
+        n_rows = sum(len(rows) for _, rows in sections)
+        self.palette = tk.Canvas(
+            right_panel,
+            width=max_cols * cell_w + 8,
+            height=n_rows * cell_h + len(sections) * title_h + 8,
+            highlightthickness=0,
+        )
+        self.palette.pack(fill="both", expand=True)
+
+        self._palette_imgs: Dict[str, int] = {}   # card name → canvas image id
+        y = 4
+        for title, section_rows in sections:
+            self.palette.create_text(4, y, text=title, anchor="nw",
+                                     font=("TkDefaultFont", 9, "bold"))
+            y += title_h
+            for row in section_rows:
+                for col, card in enumerate(row):
+                    # first tag is the card's enum name – read back on click
+                    x = 4 + col * cell_w + cell_w // 2
+                    self._palette_imgs[card.name.lower()] = self.palette.create_image(
+                        x, y + 47, image=self._get_card_image(card.name),
+                        tags=(card.name, "card"))
+                    self.palette.create_text(
+                        x, y + 96, anchor="n", text=card.name.capitalize(),
+                        tags=(card.name, "card"))
+                y += cell_h
+        self.palette.tag_bind("card", "<Button-1>", self._on_palette_click)
 
         # ▶ initial suggestion
         self._update_suggestion()
 
+    def _draw_grid(self) -> None:
+        """(Re)draw the whole state grid: one text item per heading, row
+        label and cell.  Only runs at startup and on player-count changes;
+        everything afterwards is per-item itemconfigure calls."""
+        c = self.grid_canvas
+        c.delete("all")
+        width = self.CARD_COL_W + len(self.players) * self.COL_W
+        height = self.HDR_H + len(CARDS) * self.ROW_H
+        c.configure(width=width, height=height)
+
+        self._hdr_ids: Dict[str, int] = {}
+        self._label_ids: Dict[Card, int] = {}
+        self._cell_ids: Dict[Tuple[Card, str], int] = {}
+
+        bold = ("TkDefaultFont", 9, "bold")
+        col_x = [self.CARD_COL_W + i * self.COL_W + self.COL_W // 2
+                 for i in range(len(self.players))]
+        c.create_text(6, self.HDR_H // 2, text="Card", anchor="w", font=bold)
+        self._hdr_known.clear()
+        for i, p in enumerate(self.players):
+            self._hdr_known[p] = self.known[p]
+            self._hdr_ids[p] = c.create_text(col_x[i], self.HDR_H // 2,
+                                             text=self._hdr(p), font=bold)
+        for r, card in enumerate(CARDS):
+            y = self.HDR_H + r * self.ROW_H + self.ROW_H // 2
+            self._label_ids[card] = c.create_text(
+                6, y, text=self._row_labels[card], anchor="w")
+            for i, p in enumerate(self.players):
+                self._cell_ids[(card, p)] = c.create_text(
+                    col_x[i], y, text=self._get(card, p))
+        # light separators so the canvas still reads as a table
+        for r in range(len(CARDS) + 1):
+            y = self.HDR_H + r * self.ROW_H
+            c.create_line(0, y, width, y, fill="#dddddd")
+
+    def _clear_state(self) -> None:
+        """Wipe the deduction state and blank every grid cell in place —
+        no widget teardown, just itemconfigure calls."""
+        self._state[:] = bytes(len(self._state))
+        self.case_card = [None, None, None]
+        self.known = {p: 0 for p in self.players}
+        self._dirty_rows.clear()
+        self._starred.clear()
+        for c in CARDS:
+            self._yes_players[c].clear()
+            self._no_counts[c] = 0
+        self._unsolved = [set(g) for g in GROUPS]
+        self._pending_case.clear()
+        self._possible = [ALL_CARDS_MASK] * self.MAX_P
+        self._definite = [0] * self.MAX_P
+        self._ask_constraints.clear()
+        for card in CARDS:
+            self._row_labels[card] = card.name.capitalize()
+        self._dirty_rows.update(CARDS)
+        self._flush_rows()
+        self._refresh_hdrs()
+        self._update_suggestion()
+
     # ------------------------------------------------------------------ #
     # Totals / headers
     # ------------------------------------------------------------------ #
     def _compute_totals(self) -> None:
         self.players = ["You"] + [f"Player {i}"
                                   for i in range(2, self.num_players + 1)]
+        self._player_idx = {p: i for i, p in enumerate(self.players)}
         base, extras = divmod(TOTAL_IN_PLAY, self.num_players)
         self.expected = {p: base for p in self.players}
         for i in range(1, extras + 1):
@@ -277,7 +370,10 @@ class CluedoGUI(tk.Tk):
 
     def _refresh_hdrs(self) -> None:
         for p in self.players:
-            self.tree.heading(p, text=self._hdr(p))
+            if self._hdr_known.get(p) == self.known[p]:
+                continue                    # heading unchanged – skip the Tcl call
+            self._hdr_known[p] = self.known[p]
+            self.grid_canvas.itemconfigure(self._hdr_ids[p], text=self._hdr(p))
 
     # ------------------------------------------------------------------ #
     # Helpers
@@ -295,7 +391,13 @@ class CluedoGUI(tk.Tk):
         raise ValueError(f"Unknown player: {tok}")
 
     def _parse_card(self, parts) -> Card:
-        key = " ".join(parts).lower()
+        if len(parts) == 1:            # common path: button tokens, 'own', 'ask'
+            card = CARD_BY_NAME.get(parts[0])
+            if card is not None:       # exact enum name – no lowercasing needed
+                return card
+            key = parts[0].lower()
+        else:
+            key = " ".join(parts).lower()
         card = CARD_LOOKUP.get(key)
         if card is None:
             raise ValueError(f"Unknown card: {' '.join(parts)}")
@@ -321,52 +423,119 @@ class CluedoGUI(tk.Tk):
         def pick(group):
             for card in group:
                 # Skip if it's in the case file
-                if card in self.case.values():
+                if self.case_card[CARD_GROUP[card]] is card:
                     continue
 
                 # Skip if anyone has it (✅)
-                if any(self.grid_state.get((card, p)) == YES_SYMBOL for p in self.players):
+                if self._yes_players[card]:
                     continue
 
                 # Prefer cards with at least one '?' (uncertainty)
-                col_vals = [self.grid_state.get((card, p), "") for p in self.players]
-                if "?" in col_vals:
+                if _MAYBE_CODE in self._row(card):
                     return card.name
 
             # Otherwise, pick any unsolved card (even if all ❌ — might be case file!)
             for card in group:
-                if card not in self.case.values() and not any(
-                    self.grid_state.get((card, p)) == YES_SYMBOL for p in self.players
-                ):
+                if self.case_card[CARD_GROUP[card]] is not card \
+                        and not self._yes_players[card]:
                     return card.name
 
             return "(done)"
 
-        sus  = pick(Suspect)
-        wep  = pick(Weapon)
-        room = pick(Room)
+        sus  = pick(SUSPECTS)
+        wep  = pick(WEAPONS)
+        room = pick(ROOMS)
         self.suggest_var.set(f"Next suggestion →  {sus} • {wep} • {room}")
 
 
+    def _row(self, card: Card) -> bytearray:
+        """The card's state bytes for the players in play — a C-level slice,
+        so membership/count tests on it never loop in Python."""
+        base = self._card_idx[card] * self.MAX_P
+        return self._state[base:base + len(self.players)]
+
+    def _get(self, card: Card, player: str) -> str:
+        return _SYM[self._state[self._card_idx[card] * self.MAX_P
+                                + self._player_idx[player]]]
+
+    def _set(self, card: Card, player: str, sym: str) -> None:
+        self._state[self._card_idx[card] * self.MAX_P
+                    + self._player_idx[player]] = _SYM_CODE[sym]
+
     def _mark(self, player: str, card: Card, sym: str) -> None:
-        col = self.players.index(player) + 1
-        vals = list(self.tree.item(card.name, "values"))
-        prev = self.grid_state.get((card, player))
+        prev = self._get(card, player)
+        if prev == sym:
+            return  # cell already says this – skip bookkeeping and repaint
         if prev == YES_SYMBOL and sym != YES_SYMBOL:
             self.known[player] -= 1
-        if prev in {YES_SYMBOL, NO_SYMBOL} and sym == MAYBE_SYMBOL:
+        if prev in _DEFINITIVE and sym == MAYBE_SYMBOL:
             return  # keep definitive info
-        vals[col] = sym
-        self.tree.item(card.name, values=vals)
-        self.grid_state[(card, player)] = sym
+        bit = 1 << self._card_idx[card]
+        pi = self._player_idx[player]
+        if sym == YES_SYMBOL:
+            self._definite[pi] |= bit
+            self._possible[pi] |= bit
+        elif sym == NO_SYMBOL:
+            self._definite[pi] &= ~bit
+            self._possible[pi] &= ~bit
+        if prev == YES_SYMBOL:
+            self._yes_players[card].discard(player)
+            if not self._yes_players[card] \
+                    and self.case_card[CARD_GROUP[card]] is not card:
+                self._unsolved[CARD_GROUP[card]].add(card)
+        elif prev == NO_SYMBOL:
+            self._no_counts[card] -= 1
+        if sym == YES_SYMBOL:
+            self._yes_players[card].add(player)
+            self._unsolved[CARD_GROUP[card]].discard(card)
+        elif sym == NO_SYMBOL:
+            self._no_counts[card] += 1
+            if self._no_counts[card] == len(self.players):
+                self._pending_case.append(card)
+        self._set(card, player, sym)
+        self._dirty_rows.add(card)
+
+    def _flush_rows(self) -> None:
+        """Write every dirty row back to the grid canvas — one itemconfigure
+        per cell, no row-level redraw."""
+        for card in self._dirty_rows:
+            self.grid_canvas.itemconfigure(self._label_ids[card],
+                                           text=self._row_labels[card])
+            for p, b in zip(self.players, self._row(card)):
+                self.grid_canvas.itemconfigure(self._cell_ids[(card, p)],
+                                               text=_SYM[b])
+        self._dirty_rows.clear()
 
     def _set_yes(self, player: str, card: Card) -> None:
-        if self.grid_state.get((card, player)) != YES_SYMBOL:
+        if self._get(card, player) != YES_SYMBOL:
             self.known[player] += 1
         self._mark(player, card, YES_SYMBOL)
     
 
 
+    def _propagate(self) -> None:
+        """Unit propagation over recorded asks: a shower who can only still
+        hold one of the three asked cards must hold that card."""
+        changed = True
+        while changed:
+            changed = False
+            remaining = []
+            for pi, mask in self._ask_constraints:
+                if mask & self._definite[pi]:
+                    continue                        # satisfied – drop it
+                m = mask & self._possible[pi]
+                if m and not (m & (m - 1)):         # exactly one candidate left
+                    player = self.players[pi]
+                    card = CARDS[m.bit_length() - 1]
+                    self._set_yes(player, card)
+                    for p in self.players:
+                        if p != player:
+                            self._mark(p, card, NO_SYMBOL)
+                    changed = True
+                    continue
+                remaining.append((pi, mask))
+            self._ask_constraints = remaining
+
     # ------------------------------------------------------------------
     # Case‑file helpers
     # ------------------------------------------------------------------
@@ -374,50 +543,32 @@ class CluedoGUI(tk.Tk):
         """If a card is ❌ for all players → mark as case file.  
         If only one unknown card remains in a group → mark that too.
         """
-        for group, label in ((Suspect, "suspect"), (Weapon, "weapon"), (Room, "room")):
-            if label in self.case:
-                continue
-
-            unsolved = []
-            for card in group:
-                if card in self.case.values():
-                    continue
-
-                all_no = all(
-                    self.grid_state.get((card, p)) == NO_SYMBOL
-                    for p in self.players
-                )
-                if all_no:
-                    self._set_case(card)
-                    continue
-
-                # track card for fallback logic
-                any_yes = any(self.grid_state.get((card, p)) == YES_SYMBOL for p in self.players)
-                if not any_yes:
-                    unsolved.append(card)
+        self._propagate()
+        while self._pending_case:
+            card = self._pending_case.pop()
+            if self.case_card[CARD_GROUP[card]] is None:
+                self._set_case(card)
 
-            # fallback logic: only one unknown → must be the case file
-            if label not in self.case and len(unsolved) == 1:
-                self._set_case(unsolved[0])
+        # fallback logic: only one unknown in a group → must be the case file
+        for g, unsolved in enumerate(self._unsolved):
+            if self.case_card[g] is None and len(unsolved) == 1:
+                self._set_case(next(iter(unsolved)))
 
 
     
     def _set_case(self, card: Card):
         """Visually mark a card as the case‑file solution."""
-        cat = (
-            "suspect" if isinstance(card, Suspect)
-            else "weapon" if isinstance(card, Weapon)
-            else "room"
-        )
-        if self.case.get(cat) == card:
+        g = CARD_GROUP[card]
+        if self.case_card[g] is card:
             return                              # already done
-        self.case[cat] = card
+        self.case_card[g] = card
+        self._unsolved[g].discard(card)
 
         # add a ★ prefix to the leftmost cell
-        vals = list(self.tree.item(card.name, "values"))
-        if not vals[0].startswith("★ "):
-            vals[0] = f"★ {vals[0]}"
-            self.tree.item(card.name, values=vals)
+        if card not in self._starred:
+            self._starred.add(card)
+            self._row_labels[card] = f"★ {self._row_labels[card]}"
+            self._dirty_rows.add(card)
 
         # everyone else cannot own it
         for p in self.players:
@@ -427,13 +578,15 @@ class CluedoGUI(tk.Tk):
     # ------------------------------------------------------------------ #
     # UI events
     # ------------------------------------------------------------------ #
-    def _on_row_click(self, _event) -> None:
-        sel = self.tree.selection()
-        if sel:
-            token = sel[0]
-            cur = self.cmd.get()
-            self._append_entry(token)
-            self.entry.icursor("end")
+    def _on_palette_click(self, _event) -> None:
+        item = self.palette.find_withtag("current")
+        if item:
+            self._append_entry(self.palette.gettags(item[0])[0])
+
+    def _on_grid_click(self, event) -> None:
+        row = (event.y - self.HDR_H) // self.ROW_H
+        if 0 <= row < len(CARDS):
+            self._append_entry(CARDS[row].name)
 
     # ------------------------------------------------------------------ #
     # Command router
@@ -444,21 +597,19 @@ class CluedoGUI(tk.Tk):
         if not text:
             return
         cmd, *args = text.split()
-        try:
-            {
-                "own":  self._c_own,
-                "not":  self._c_not,
-                "has":  self._c_has,
-                "ask":  self._c_ask,
-                "play": self._c_play,      # ⇒ play = ask with bypass logic
-                "is":   self._c_is,
-                "reset": lambda *_: self._reset(),
-                "help":  lambda *_: self._help()
-            }[cmd.lower()](args)
-        except KeyError:
+        handler = self._cmds.get(cmd.lower())
+        if handler is None:
+            from tkinter import messagebox
             messagebox.showerror("Error", "Unknown command")
+            return
+        try:
+            handler(args)
         except (IndexError, ValueError) as exc:
+            from tkinter import messagebox
             messagebox.showerror("Error", str(exc))
+        finally:
+            # one deferred repaint per command, even on error paths
+            self.update_idletasks()
 
     # ------------------------------------------------------------------ #
     # Command implementations
@@ -475,6 +626,13 @@ class CluedoGUI(tk.Tk):
 
         owned = set(cards)
 
+        current_owned = {c for c in CARDS if self._get(c, "You") == YES_SYMBOL}
+        if current_owned == owned and all(
+            self._get(c, p) == NO_SYMBOL
+            for c in owned for p in self.players[1:]
+        ):
+            return      # the board already reflects this hand – nothing to write
+
         for card in CARDS:
             if card in owned:
                 self._set_yes("You", card)
@@ -483,8 +641,9 @@ class CluedoGUI(tk.Tk):
             else:
                 self._mark("You", card, NO_SYMBOL)
 
-        self._refresh_hdrs()
         self._auto_deduce_case()
+        self._flush_rows()
+        self._refresh_hdrs()
         self._update_suggestion()
 
 
@@ -494,8 +653,9 @@ class CluedoGUI(tk.Tk):
         player = self._normalize_player(args[0])
         card   = self._parse_card(args[1:])
         self._mark(player, card, NO_SYMBOL)
-        self._refresh_hdrs()
         self._auto_deduce_case()          # NEW
+        self._flush_rows()
+        self._refresh_hdrs()
         self._update_suggestion()         # (if you added the suggestion line)
 
 
@@ -509,8 +669,9 @@ class CluedoGUI(tk.Tk):
         for p in self.players:
             if p != player:
                 self._mark(p, card, NO_SYMBOL)
-        self._refresh_hdrs()
         self._auto_deduce_case()          # NEW
+        self._flush_rows()
+        self._refresh_hdrs()
         self._update_suggestion()         # (if you added the suggestion line)
 
 
@@ -520,8 +681,9 @@ class CluedoGUI(tk.Tk):
             raise IndexError
         card = self._parse_card(args)
         self._set_case(card)
-        self._refresh_hdrs()
         self._auto_deduce_case()          # NEW
+        self._flush_rows()
+        self._refresh_hdrs()
         self._update_suggestion()         # (if you added the suggestion line)
 
 
@@ -554,8 +716,8 @@ class CluedoGUI(tk.Tk):
                   else [self._normalize_player(t) for t in tail]
 
         # every other opponent is known NOT to have any of the three cards
-        bypasses = [p for p in self.players
-                    if p not in {asker, "You", *showers}]
+        involved = {asker, "You", *showers}
+        bypasses = [p for p in self.players if p not in involved]
         for p in bypasses:
             for c in cards:
                 self._mark(p, c, NO_SYMBOL)
@@ -564,7 +726,7 @@ class CluedoGUI(tk.Tk):
         owned_two_holder = None
         for player in {"You", asker}:
             yes_count = sum(
-                self.grid_state.get((c, player)) == YES_SYMBOL
+                self._get(c, player) == YES_SYMBOL
                 for c in cards
             )
             if yes_count >= 2:
@@ -575,9 +737,13 @@ class CluedoGUI(tk.Tk):
         if owned_two_holder:
             deduced = next(
                 c for c in cards
-                if self.grid_state.get((c, owned_two_holder)) != YES_SYMBOL
+                if self._get(c, owned_two_holder) != YES_SYMBOL
             )
 
+        trio_mask = 0
+        for c in cards:
+            trio_mask |= 1 << self._card_idx[c]
+
         for shower in showers:
             if deduced:
                 self._set_yes(shower, deduced)
@@ -588,12 +754,15 @@ class CluedoGUI(tk.Tk):
                     if c != deduced:
                         self._mark(shower, c, NO_SYMBOL)
             else:
+                # remember "shower holds ≥1 of this trio" for later propagation
+                self._ask_constraints.append((self._player_idx[shower], trio_mask))
                 for c in cards:
                     self._mark(shower, c, MAYBE_SYMBOL)
 
         # --- 3. finish up ---------------------------------------------
-        self._refresh_hdrs()
         self._auto_deduce_case()
+        self._flush_rows()
+        self._refresh_hdrs()
         self._update_suggestion()
 
         # ------------------------------------------------------------------ #
@@ -618,12 +787,13 @@ class CluedoGUI(tk.Tk):
         if len(tail) == 1 and tail[0].lower() == "none":
             # Nobody answered → deduce for each card
             for c in trio:
-                if self.grid_state.get((c, "You")) != YES_SYMBOL:
+                if self._get(c, "You") != YES_SYMBOL:
                     for p in self.players:
                         if p != "You":
                             self._mark(p, c, NO_SYMBOL)
-            self._refresh_hdrs()
             self._auto_deduce_case()
+            self._flush_rows()
+            self._refresh_hdrs()
             self._update_suggestion()
             return
 
@@ -644,15 +814,16 @@ class CluedoGUI(tk.Tk):
             pairs.append((player, shown))
 
         showers = {p for p, _ in pairs}
-        bypasses = [p for p in self.players if p not in {asker, "You"} | showers]
+        involved = {asker, "You"} | showers
+        bypasses = [p for p in self.players if p not in involved]
 
         # ---- mark based on what each player showed or didn’t
         for shower, shown in pairs:
             if shown:
                 self._set_yes(shower, shown)
                 for c in trio:
-                    if c != shown and self.grid_state.get((c, shower)) not in {YES_SYMBOL, NO_SYMBOL}:
-                        self._mark(shower, c, M)
+                    if c != shown and self._get(c, shower) not in _DEFINITIVE:
+                        self._mark(shower, c, MAYBE_SYMBOL)
                 for p in self.players:
                     if p != shower:
                         self._mark(p, shown, NO_SYMBOL)
@@ -666,8 +837,9 @@ class CluedoGUI(tk.Tk):
             for c in trio:
                 self._mark(p, c, NO_SYMBOL)
 
-        self._refresh_hdrs()
         self._auto_deduce_case()
+        self._flush_rows()
+        self._refresh_hdrs()
         self._update_suggestion()
 
 
@@ -677,13 +849,16 @@ class CluedoGUI(tk.Tk):
     # Misc UI helpers
     # ------------------------------------------------------------------ #
     def _reset(self):
+        from tkinter import messagebox
         if messagebox.askyesno("Reset", "Clear the grid?"):
-            self._build_ui()
+            self._clear_state()
 
     def _help(self):
+        from tkinter import messagebox
         messagebox.showinfo("Commands", HELP_TEXT)
 
     def _player_count_dialog(self):
+        from tkinter import simpledialog
         n = simpledialog.askinteger(
             "Players", "Number of players (3–6):",
             parent=self,
@@ -692,7 +867,9 @@ class CluedoGUI(tk.Tk):
         )
         if n and n != self.num_players:
             self.num_players = n
-            self._build_ui()
+            self._compute_totals()
+            self._draw_grid()
+            self._clear_state()
     
 
 # --------------------------------------------------------------------------- #
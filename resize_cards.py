@@ -1,26 +1,41 @@
-from PIL import Image
+from concurrent.futures import ProcessPoolExecutor
 import os
 
+from PIL import Image
+
 # Configuration
 INPUT_FOLDER = "cards_raw"         # folder with original card images
 OUTPUT_FOLDER = "cards_resized"    # where resized images will be saved
 TARGET_SIZE = (60, 94)             # width x height
 
-# Create output folder if it doesn't exist
-os.makedirs(OUTPUT_FOLDER, exist_ok=True)
-
-# Go through all files in the input folder
-for filename in os.listdir(INPUT_FOLDER):
-    if not filename.lower().endswith((".png", ".jpg", ".jpeg")):
-        continue  # skip non-image files
 
+def resize_one(filename: str) -> str:
     input_path = os.path.join(INPUT_FOLDER, filename)
     output_path = os.path.join(OUTPUT_FOLDER, os.path.splitext(filename)[0] + ".png")
 
     try:
         with Image.open(input_path) as img:
-            resized = img.resize(TARGET_SIZE, Image.LANCZOS)
-            resized.save(output_path, format="PNG")
-            print(f"✔ Saved: {output_path}")
+            # For JPEGs this decodes at a reduced DCT scale instead of
+            # decompressing the full image only to throw the pixels away.
+            img.draft("RGB", (TARGET_SIZE[0] * 2, TARGET_SIZE[1] * 2))
+            img.thumbnail(TARGET_SIZE, Image.LANCZOS)
+            img.save(output_path, format="PNG")
+        return f"✔ Saved: {output_path}"
     except Exception as e:
-        print(f"⚠ Error processing {filename}: {e}")
+        return f"⚠ Error processing {filename}: {e}"
+
+
+def main() -> None:
+    # Create output folder if it doesn't exist
+    os.makedirs(OUTPUT_FOLDER, exist_ok=True)
+
+    filenames = [f for f in os.listdir(INPUT_FOLDER)
+                 if f.lower().endswith((".png", ".jpg", ".jpeg"))]
+
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as pool:
+        for message in pool.map(resize_one, filenames):
+            print(message)
+
+
+if __name__ == "__main__":
+    main()